@@ -15,9 +15,13 @@ Examples:
 
 import sys
 import re
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+_TAG_RE = re.compile(r'(?:tagged|tag:)\s+(\w+)')
+
 class QueryBuilder:
     """Build CAP queries from natural language"""
     
@@ -30,6 +34,9 @@ class QueryBuilder:
         "docs": ["document", "note", "file", "bookmark", "snippet"]
     }
     
+    # (keyword, shelf) in detection order, flattened once
+    _SHELF_KEYWORDS = tuple((keyword, shelf) for shelf, keywords in SHELF_PATTERNS.items() for keyword in keywords)
+    
     # Time patterns
     TIME_PATTERNS = {
         "today": ("today", "today"),
@@ -43,6 +50,13 @@ class QueryBuilder:
         "last month": ("-30days", "today"),
     }
     
+    # Filter keys for the (start, end) of a time pattern, per shelf
+    TIME_FILTER_KEYS = {
+        "calendar": ("start_date", "end_date"),
+        "tasks": ("due_date_start", "due_date_end"),
+        "comms": ("timestamp_after", "timestamp_before")
+    }
+    
     # Priority patterns
     PRIORITY_PATTERNS = {
         "urgent": "urgent",
@@ -65,6 +79,44 @@ class QueryBuilder:
         "in progress": "active"
     }
     
+    # Read patterns ("unread" contains "read", so it must win)
+    READ_PATTERNS = {
+        "unread": "false",
+        "read": "true"
+    }
+    
+    # Type patterns, per shelf
+    TYPE_PATTERNS = {
+        "calendar": {
+            "event": "event",
+            "reminder": "reminder",
+            "block": "block"
+        },
+        "tasks": {
+            "task": "task",
+            "project": "project",
+            "milestone": "milestone"
+        },
+        "comms": {
+            "email": "email",
+            "message": "message",
+            "call": "call"
+        },
+        "identity": {
+            "person": "person",
+            "people": "person",
+            "organization": "org",
+            "org": "org",
+            "role": "role"
+        },
+        "docs": {
+            "note": "note",
+            "file": "file",
+            "snippet": "snippet",
+            "bookmark": "bookmark"
+        }
+    }
+    
     def __init__(self, query: str):
         self.query = query.lower()
         self.shelf = None
@@ -78,14 +130,9 @@ class QueryBuilder:
         if not self.shelf:
             return f"# Error: Could not determine shelf from query: '{self.query}'"
         
-        # Extract filters
-        self._extract_time_filters()
-        self._extract_priority_filters()
-        self._extract_status_filters()
-        self._extract_read_filters()
-        self._extract_type_filters()
-        self._extract_email_filters()
-        self._extract_tag_filters()
+        # Extract filters that apply to this shelf
+        for extract in self._SHELF_EXTRACTORS[self.shelf]:
+            extract(self)
         
         # Build query string
         query_str = f"cap://{self.shelf}"
@@ -98,26 +145,21 @@ class QueryBuilder:
     
     def _detect_shelf(self) -> str:
         """Detect which shelf to query"""
-        for shelf, keywords in self.SHELF_PATTERNS.items():
-            for keyword in keywords:
-                if keyword in self.query:
-                    return shelf
+        query = self.query
+        for keyword, shelf in self._SHELF_KEYWORDS:
+            if keyword in query:
+                return shelf
         return None
     
     def _extract_time_filters(self):
         """Extract time-based filters"""
         for pattern, (start, end) in self.TIME_PATTERNS.items():
             if pattern in self.query:
-                if self.shelf == "calendar":
-                    self.filters["start_date"] = start
-                    self.filters["end_date"] = end
-                elif self.shelf == "tasks":
-                    self.filters["due_date_start"] = start
-                    self.filters["due_date_end"] = end
-                elif self.shelf == "comms":
-                    self.filters["timestamp_after"] = start
-                    if end != start:
-                        self.filters["timestamp_before"] = end
+                start_key, end_key = self.TIME_FILTER_KEYS[self.shelf]
+                self.filters[start_key] = start
+                # Single-day windows only bound the start of comms timestamps
+                if self.shelf != "comms" or end != start:
+                    self.filters[end_key] = end
                 return
         
         # Check for "due" keyword
@@ -129,9 +171,6 @@ class QueryBuilder:
     
     def _extract_priority_filters(self):
         """Extract priority filters"""
-        if self.shelf != "tasks":
-            return
-        
         for pattern, priority in self.PRIORITY_PATTERNS.items():
             if pattern in self.query:
                 self.filters["priority"] = priority
@@ -139,9 +178,6 @@ class QueryBuilder:
     
     def _extract_status_filters(self):
         """Extract status filters"""
-        if self.shelf not in ["tasks", "calendar"]:
-            return
-        
         for pattern, status in self.STATUS_PATTERNS.items():
             if pattern in self.query:
                 self.filters["status"] = status
@@ -149,58 +185,26 @@ class QueryBuilder:
     
     def _extract_read_filters(self):
         """Extract read/unread filters"""
-        if self.shelf != "comms":
-            return
-        
-        if "unread" in self.query:
-            self.filters["is_read"] = "false"
-        elif "read" in self.query:
-            self.filters["is_read"] = "true"
+        for pattern, is_read in self.READ_PATTERNS.items():
+            if pattern in self.query:
+                self.filters["is_read"] = is_read
+                return
     
     def _extract_type_filters(self):
         """Extract type filters"""
-        type_map = {
-            "calendar": {
-                "event": "event",
-                "reminder": "reminder",
-                "block": "block"
-            },
-            "tasks": {
-                "task": "task",
-                "project": "project",
-                "milestone": "milestone"
-            },
-            "comms": {
-                "email": "email",
-                "message": "message",
-                "call": "call"
-            },
-            "identity": {
-                "person": "person",
-                "people": "person",
-                "organization": "org",
-                "org": "org",
-                "role": "role"
-            },
-            "docs": {
-                "note": "note",
-                "file": "file",
-                "snippet": "snippet",
-                "bookmark": "bookmark"
-            }
-        }
-        
-        if self.shelf in type_map:
-            for keyword, type_value in type_map[self.shelf].items():
-                if keyword in self.query:
-                    self.filters["type"] = type_value
-                    return
+        for keyword, type_value in self.TYPE_PATTERNS[self.shelf].items():
+            if keyword in self.query:
+                self.filters["type"] = type_value
+                return
     
     def _extract_email_filters(self):
         """Extract email address filters"""
+        # Cheap literal check before running the regex
+        if "@" not in self.query:
+            return
+        
         # Look for email patterns
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, self.query)
+        emails = _EMAIL_RE.findall(self.query)
         
         if emails:
             email = emails[0]
@@ -218,11 +222,38 @@ class QueryBuilder:
     def _extract_tag_filters(self):
         """Extract tag filters"""
         # Look for "tagged" or "tag" keywords
-        if "tagged" in self.query or "tag:" in self.query:
-            # Extract tag name (word after "tagged" or "tag:")
-            match = re.search(r'(?:tagged|tag:)\s+(\w+)', self.query)
-            if match:
-                self.filters["tags"] = match.group(1)
+        if "tag" not in self.query:
+            return
+        
+        # Extract tag name (word after "tagged" or "tag:")
+        match = _TAG_RE.search(self.query)
+        if match:
+            self.filters["tags"] = match.group(1)
+    
+    # Filter extractors that apply to each shelf, in extraction order
+    _SHELF_EXTRACTORS = {
+        "calendar": (_extract_time_filters, _extract_status_filters, _extract_type_filters,
+                     _extract_email_filters, _extract_tag_filters),
+        "tasks": (_extract_time_filters, _extract_priority_filters, _extract_status_filters,
+                  _extract_type_filters, _extract_tag_filters),
+        "comms": (_extract_time_filters, _extract_read_filters, _extract_type_filters,
+                  _extract_email_filters, _extract_tag_filters),
+        "identity": (_extract_type_filters, _extract_tag_filters),
+        "docs": (_extract_type_filters, _extract_tag_filters)
+    }
+
+@lru_cache(maxsize=4096)
+def build_cap_query(query: str) -> Tuple[str, str, Tuple[Tuple[str, str], ...]]:
+    """
+    Build a CAP query string from natural language, memoized per query
+    
+    Returns:
+        (query_string, shelf, filters) where filters is a tuple of
+        (key, value) pairs in the order they were extracted
+    """
+    builder = QueryBuilder(query)
+    result = builder.build()
+    return result, builder.shelf, tuple(builder.filters.items())
 
 def main():
     if len(sys.argv) < 2:
@@ -233,20 +264,17 @@ def main():
         print('  python build_query.py "calendar events for next month"', file=sys.stderr)
         sys.exit(1)
     
-    query = " ".join(sys.argv[1:])
-    
-    builder = QueryBuilder(query)
-    result = builder.build()
+    result, shelf, filters = build_cap_query(" ".join(sys.argv[1:]))
     
     print(result)
     
     # Also print explanation
     if result.startswith("cap://"):
         print(f"\n# Query Explanation:")
-        print(f"# Shelf: {builder.shelf}")
-        if builder.filters:
+        print(f"# Shelf: {shelf}")
+        if filters:
             print(f"# Filters:")
-            for key, value in builder.filters.items():
+            for key, value in filters:
                 print(f"#   - {key}: {value}")
         else:
             print(f"# No filters applied")
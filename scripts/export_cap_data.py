@@ -5,253 +5,428 @@ CAP Data Exporter
 Exports CAP data to various formats (CSV, JSON, Markdown).
 
 Usage:
-    python export_cap_data.py --format <format> --shelf <shelf> --output <file> [--data <json>]
+    python export_cap_data.py --format <format> --shelf <shelf> --output <file> [--data <json>] [--workers <n>]
     
 Examples:
     python export_cap_data.py --format csv --shelf tasks --output tasks.csv --data '[{...}]'
     python export_cap_data.py --format markdown --shelf calendar --output events.md --data '[{...}]'
+    python export_cap_data.py --format markdown --shelf comms --output comms.md --workers 4 < comms.json
 """
 
 import json
 import sys
 import csv
 import argparse
-from datetime import datetime
-from typing import List, Dict, Any
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice, repeat
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Tuple
+
+# orjson is an optional speedup for serializing; fall back to the stdlib when it's missing.
+# Input is always parsed with the stdlib so big integers keep their precision. orjson's
+# output is not byte-identical to json.dumps: NaN/Infinity become null and exponent-form
+# floats are spelled differently (1e-7 vs 1e-07); see the README.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    
+    def _dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the stdlib writes exactly
+            return _stdlib_dumps(obj)
+    
+    def _dumps_items(items: List[Any]) -> bytes:
+        """Comma-separated JSON export entries, indented to sit inside the items array"""
+        # Raw newlines only appear between tokens, so re-indenting is safe
+        return b',\n'.join([b'    ' + _dumps(item).replace(b'\n', b'\n    ') for item in items])
+else:
+    _dumps = _stdlib_dumps
+    _ITEMS_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+    
+    def _dumps_items(items: List[Any]) -> bytes:
+        """Comma-separated JSON export entries, indented to sit inside the items array"""
+        # One encode per batch is cheaper than one json.dumps per item: strip the
+        # list's "[\n" and "\n]", then indent every line two more spaces
+        return ('  ' + _ITEMS_ENCODER.encode(items)[2:-2].replace('\n', '\n  ')).encode('utf-8')
+
+class FlattenSpec(NamedTuple):
+    """CSV projection for one shelf"""
+    fields: Tuple[str, ...]
+    list_keys: FrozenSet[str] = frozenset()
+    nested_paths: Mapping[str, Tuple[str, str]] = MappingProxyType({})
+
+_COMMON_CSV_FIELDS = ("id", "created_at", "updated_at", "source_system", "confidence", "sensitivity")
+_COMMON_NESTED_PATHS = MappingProxyType({"source_system": ("source", "system")})
+
+# Per-shelf CSV columns; only the keys a shelf exports are ever touched
+_FLATTEN_SPECS = {
+    "calendar": FlattenSpec(
+        _COMMON_CSV_FIELDS + ("type", "title", "start_time", "end_time", "all_day", "location", "status"),
+        nested_paths=_COMMON_NESTED_PATHS
+    ),
+    "tasks": FlattenSpec(
+        _COMMON_CSV_FIELDS + ("type", "title", "status", "priority", "due_date", "project"),
+        nested_paths=_COMMON_NESTED_PATHS
+    ),
+    "comms": FlattenSpec(
+        _COMMON_CSV_FIELDS + ("type", "thread_id", "from", "to", "subject", "timestamp", "is_read"),
+        list_keys=frozenset({"to"}),
+        nested_paths=_COMMON_NESTED_PATHS
+    ),
+    "identity": FlattenSpec(
+        _COMMON_CSV_FIELDS + ("type", "name_full", "name_display", "emails", "phones", "tags"),
+        list_keys=frozenset({"emails", "phones", "tags"}),
+        nested_paths=MappingProxyType({
+            **_COMMON_NESTED_PATHS,
+            "name_full": ("name", "full"),
+            "name_display": ("name", "display")
+        })
+    ),
+    "docs": FlattenSpec(
+        _COMMON_CSV_FIELDS + ("type", "title", "content_preview", "url", "tags"),
+        list_keys=frozenset({"tags"}),
+        nested_paths=_COMMON_NESTED_PATHS
+    )
+}
+_DEFAULT_FLATTEN_SPEC = FlattenSpec(_COMMON_CSV_FIELDS, nested_paths=_COMMON_NESTED_PATHS)
+
+# Streaming exports issue many small writes; batch them in a 1 MiB buffer
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Items serialized per call while streaming a JSON export
+_JSON_BATCH_SIZE = 1024
+
+# Markdown markers
+_PRIORITY_EMOJI = {"urgent": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}
+_DEFAULT_PRIORITY_EMOJI = "⚪"
+_COMMS_EMOJI = {"email": "📧", "message": "💬", "call": "📞"}
+_DEFAULT_COMMS_EMOJI = "📄"
+_STATUS_TITLE = {
+    "pending": "Pending",
+    "active": "Active",
+    "blocked": "Blocked",
+    "completed": "Completed",
+    "cancelled": "Cancelled",
+    "unknown": "Unknown"
+}
+_SHELF_TITLE = {
+    "calendar": "Calendar",
+    "tasks": "Tasks",
+    "comms": "Comms",
+    "identity": "Identity",
+    "docs": "Docs"
+}
+
+def _csv_extractor(field: str, spec: FlattenSpec,
+                   sample: Dict[str, Any]) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Build a function returning the CSV cell for `field` from an item
+    
+    Exports are usually homogeneous, so `sample` (the first item) picks the
+    shape to optimize for; items that don't match fall back to the guarded
+    extraction.
+    """
+    if field in spec.nested_paths:
+        parent, child = spec.nested_paths[field]
+        
+        def extract(item):
+            value = item.get(parent)
+            return value.get(child, "") if isinstance(value, dict) else ""
+        
+        if isinstance(sample.get(parent), dict):
+            guarded = extract
+            
+            def extract(item):
+                try:
+                    return item[parent].get(child, "")
+                except (KeyError, TypeError, AttributeError):
+                    return guarded(item)
+    elif field in spec.list_keys:
+        # Strings are iterable too, so list fields always keep their guard
+        def extract(item):
+            value = item.get(field)
+            return ", ".join(str(x) for x in value) if isinstance(value, list) else ""
+    else:
+        def extract(item):
+            return item.get(field, "")
+    
+    return extract
+
+# Markdown block formatters, one call per item. They live at module level
+# so worker processes can unpickle them for parallel exports.
+
+def _calendar_markdown(item: Dict[str, Any]) -> str:
+    location = f"**Location:** {item['location']}\n\n" if item.get('location') else ""
+    
+    attendees = ""
+    if item.get('attendees'):
+        attendees = "**Attendees:**\n" + "".join(
+            f"- {attendee.get('email', 'Unknown')} ({attendee.get('status', 'pending')})\n"
+            for attendee in item['attendees']
+        ) + "\n"
+    
+    return (
+        f"## {item.get('title', 'Untitled Event')}\n\n"
+        f"**When:** {item.get('start_time', 'N/A')} - {item.get('end_time', 'N/A')}\n\n"
+        f"{location}{attendees}"
+        f"**Status:** {item.get('status', 'unknown')}\n\n"
+        "---\n\n"
+    )
+
+def _task_markdown(task: Dict[str, Any]) -> str:
+    emoji = _PRIORITY_EMOJI.get(task.get('priority', 'medium'), _DEFAULT_PRIORITY_EMOJI)
+    due = f" (Due: {task['due_date']})" if task.get('due_date') else ""
+    project = f" - *{task['project']}*" if task.get('project') else ""
+    
+    return f"- {emoji} **{task.get('title', 'Untitled Task')}**{due}{project}\n"
+
+def _comms_markdown(item: Dict[str, Any]) -> str:
+    emoji = _COMMS_EMOJI.get(item.get('type', 'unknown'), _DEFAULT_COMMS_EMOJI)
+    
+    to = ""
+    if item.get('to'):
+        to_list = ", ".join(item['to']) if isinstance(item['to'], list) else item['to']
+        to = f"**To:** {to_list}\n\n"
+    
+    preview = f"**Preview:** {item['body_preview']}\n\n" if item.get('body_preview') else ""
+    
+    return (
+        f"## {emoji} {item.get('subject', 'No Subject')}\n\n"
+        f"**From:** {item.get('from', 'Unknown')}\n\n"
+        f"{to}"
+        f"**Time:** {item.get('timestamp', 'N/A')}\n\n"
+        f"{preview}"
+        "---\n\n"
+    )
+
+def _identity_markdown(item: Dict[str, Any]) -> str:
+    name = item.get('name', {})
+    display_name = name.get('display', name.get('full', 'Unknown'))
+    
+    emails = ""
+    if item.get('emails'):
+        emails = "**Emails:**\n" + "".join(f"- {email}\n" for email in item['emails']) + "\n"
+    
+    phones = ""
+    if item.get('phones'):
+        phones = "**Phones:**\n" + "".join(f"- {phone}\n" for phone in item['phones']) + "\n"
+    
+    tags = f"**Tags:** {', '.join(item['tags'])}\n\n" if item.get('tags') else ""
+    
+    return (
+        f"## {display_name}\n\n"
+        f"**Type:** {item.get('type', 'unknown')}\n\n"
+        f"{emails}{phones}{tags}"
+        "---\n\n"
+    )
+
+def _docs_markdown(item: Dict[str, Any]) -> str:
+    url = f"**URL:** [{item['url']}]({item['url']})\n\n" if item.get('url') else ""
+    preview = f"**Preview:**\n\n{item['content_preview']}\n\n" if item.get('content_preview') else ""
+    tags = f"**Tags:** {', '.join(item['tags'])}\n\n" if item.get('tags') else ""
+    
+    return (
+        f"## {item.get('title', 'Untitled Document')}\n\n"
+        f"**Type:** {item.get('type', 'unknown')}\n\n"
+        f"{url}{preview}{tags}"
+        "---\n\n"
+    )
+
+def _generic_markdown(item: Dict[str, Any]) -> str:
+    return (
+        f"## Item: {item.get('id', 'unknown')}\n\n"
+        f"```json\n{json.dumps(item, indent=2)}\n```\n\n"
+        "---\n\n"
+    )
+
+def _format_markdown_chunk(format_item: Callable[[Dict[str, Any]], str],
+                           chunk: List[Dict[str, Any]]) -> List[str]:
+    """Worker entry point for parallel Markdown exports"""
+    return list(map(format_item, chunk))
 
 class CAPExporter:
     """Exporter for CAP data to various formats"""
     
-    def __init__(self, data: List[Dict[str, Any]], shelf: str):
-        self.data = data
+    def __init__(self, data: Iterable[Dict[str, Any]], shelf: str, workers: int = 1):
+        """
+        Args:
+            data: Items to export. Any iterable works; CSV and JSON exports
+                stream it one item at a time, so an iterator is consumed
+                by the first export that reads it.
+            shelf: CAP shelf the items belong to
+            workers: Processes used to format Markdown exports (1 = in-process)
+        """
+        self._items = data
         self.shelf = shelf
+        self.workers = workers
+        self._spec = _FLATTEN_SPECS.get(shelf, _DEFAULT_FLATTEN_SPEC)
+        
+        # One export timestamp per exporter, shared by every format
+        now = datetime.now(timezone.utc)
+        self._exported_at_iso = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+        self._exported_at_human = now.strftime("%Y-%m-%d %H:%M:%S UTC")
     
     def export_csv(self, output_file: str):
         """Export data to CSV format"""
-        if not self.data:
+        items = iter(self._items)
+        for first in items:
+            break
+        else:
             print("Warning: No data to export", file=sys.stderr)
             return
         
         # Determine fields based on shelf type
         fields = self._get_csv_fields()
+        extractors = [_csv_extractor(field, self._spec, first) for field in fields]
+        count = 0
         
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
-            writer.writeheader()
-            
-            for item in self.data:
-                # Flatten nested structures for CSV
-                flat_item = self._flatten_item(item)
-                writer.writerow(flat_item)
+        def rows():
+            nonlocal count
+            for item in chain((first,), items):
+                count += 1
+                # Flatten nested structures for CSV, one cell per column
+                yield [extract(item) for extract in extractors]
+        
+        with open(output_file, 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            writer.writerows(rows())
         
-        print(f"✅ Exported {len(self.data)} items to {output_file}")
+        print(f"✅ Exported {count} items to {output_file}")
     
     def export_json(self, output_file: str):
         """Export data to JSON format"""
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                "shelf": self.shelf,
-                "exported_at": datetime.utcnow().isoformat() + "Z",
-                "count": len(self.data),
-                "items": self.data
-            }, f, indent=2, ensure_ascii=False)
+        count = 0
+        
+        # Write the envelope by hand so items are serialized in bounded batches;
+        # the count is only known once they have all been written.
+        items = iter(self._items)
+        with open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(b'{\n  "shelf": ' + _dumps(self.shelf))
+            f.write(b',\n  "exported_at": ' + _dumps(self._exported_at_iso))
+            f.write(b',\n  "items": [')
+            
+            while True:
+                batch = list(islice(items, _JSON_BATCH_SIZE))
+                if not batch:
+                    break
+                f.write(b',\n' if count else b'\n')
+                f.write(_dumps_items(batch))
+                count += len(batch)
+            
+            f.write(b'\n  ],' if count else b'],')
+            f.write(b'\n  "count": ' + str(count).encode() + b'\n}')
         
-        print(f"✅ Exported {len(self.data)} items to {output_file}")
+        print(f"✅ Exported {count} items to {output_file}")
     
     def export_markdown(self, output_file: str):
         """Export data to Markdown format"""
+        # The header needs the item count and tasks are grouped by status,
+        # so Markdown exports materialize the items
+        if not isinstance(self._items, list):
+            self._items = list(self._items)
+        
+        # Header
+        parts = [
+            f"# {_SHELF_TITLE.get(self.shelf) or self.shelf.title()} Export\n\n",
+            f"**Exported:** {self._exported_at_human}\n\n",
+            f"**Total Items:** {len(self._items)}\n\n",
+            "---\n\n"
+        ]
+        
+        # Items based on shelf type
+        if self.shelf == "calendar":
+            self._export_calendar_markdown(parts)
+        elif self.shelf == "tasks":
+            self._export_tasks_markdown(parts)
+        elif self.shelf == "comms":
+            self._export_comms_markdown(parts)
+        elif self.shelf == "identity":
+            self._export_identity_markdown(parts)
+        elif self.shelf == "docs":
+            self._export_docs_markdown(parts)
+        else:
+            self._export_generic_markdown(parts)
+        
         with open(output_file, 'w', encoding='utf-8') as f:
-            # Write header
-            f.write(f"# {self.shelf.title()} Export\n\n")
-            f.write(f"**Exported:** {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}\n\n")
-            f.write(f"**Total Items:** {len(self.data)}\n\n")
-            f.write("---\n\n")
-            
-            # Write items based on shelf type
-            if self.shelf == "calendar":
-                self._export_calendar_markdown(f)
-            elif self.shelf == "tasks":
-                self._export_tasks_markdown(f)
-            elif self.shelf == "comms":
-                self._export_comms_markdown(f)
-            elif self.shelf == "identity":
-                self._export_identity_markdown(f)
-            elif self.shelf == "docs":
-                self._export_docs_markdown(f)
-            else:
-                self._export_generic_markdown(f)
+            f.write("".join(parts))
         
-        print(f"✅ Exported {len(self.data)} items to {output_file}")
+        print(f"✅ Exported {len(self._items)} items to {output_file}")
     
     def _get_csv_fields(self) -> List[str]:
         """Get CSV field names based on shelf type"""
-        common = ["id", "created_at", "updated_at", "source_system", "confidence", "sensitivity"]
-        
-        shelf_fields = {
-            "calendar": ["type", "title", "start_time", "end_time", "all_day", "location", "status"],
-            "tasks": ["type", "title", "status", "priority", "due_date", "project"],
-            "comms": ["type", "thread_id", "from", "to", "subject", "timestamp", "is_read"],
-            "identity": ["type", "name_full", "name_display", "emails", "phones", "tags"],
-            "docs": ["type", "title", "content_preview", "url", "tags"]
-        }
-        
-        return common + shelf_fields.get(self.shelf, [])
+        return list(self._spec.fields)
     
-    def _flatten_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
-        """Flatten nested structures for CSV export"""
-        flat = {}
-        
-        # Copy simple fields
-        for key in ["id", "type", "title", "status", "priority", "created_at", "updated_at", "confidence", "sensitivity"]:
-            if key in item:
-                flat[key] = item[key]
-        
-        # Flatten source
-        if "source" in item and isinstance(item["source"], dict):
-            flat["source_system"] = item["source"].get("system", "")
-        
-        # Flatten name (identity)
-        if "name" in item and isinstance(item["name"], dict):
-            flat["name_full"] = item["name"].get("full", "")
-            flat["name_display"] = item["name"].get("display", "")
+    def _format_markdown_items(self, format_item: Callable[[Dict[str, Any]], str],
+                               items: List[Dict[str, Any]]) -> List[str]:
+        """Format items to Markdown blocks, across worker processes if enabled"""
+        workers = min(self.workers, len(items))
+        if workers <= 1:
+            return list(map(format_item, items))
         
-        # Convert arrays to comma-separated strings
-        for key in ["emails", "phones", "tags", "to"]:
-            if key in item and isinstance(item[key], list):
-                flat[key] = ", ".join(str(x) for x in item[key])
-        
-        # Copy other fields
-        for key in ["from", "subject", "timestamp", "is_read", "start_time", "end_time", 
-                    "all_day", "location", "due_date", "project", "content_preview", "url", "thread_id"]:
-            if key in item:
-                flat[key] = item[key]
-        
-        return flat
+        # Contiguous chunks keep the blocks in their original order
+        size = -(-len(items) // workers)
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        with ProcessPoolExecutor(workers) as pool:
+            blocks = pool.map(_format_markdown_chunk, repeat(format_item), chunks)
+            return [block for chunk_blocks in blocks for block in chunk_blocks]
     
-    def _export_calendar_markdown(self, f):
+    def _export_calendar_markdown(self, parts: List[str]):
         """Export calendar events to Markdown"""
-        for item in self.data:
-            f.write(f"## {item.get('title', 'Untitled Event')}\n\n")
-            
-            start = item.get('start_time', 'N/A')
-            end = item.get('end_time', 'N/A')
-            f.write(f"**When:** {start} - {end}\n\n")
-            
-            if item.get('location'):
-                f.write(f"**Location:** {item['location']}\n\n")
-            
-            if item.get('attendees'):
-                f.write("**Attendees:**\n")
-                for attendee in item['attendees']:
-                    status = attendee.get('status', 'pending')
-                    f.write(f"- {attendee.get('email', 'Unknown')} ({status})\n")
-                f.write("\n")
-            
-            f.write(f"**Status:** {item.get('status', 'unknown')}\n\n")
-            f.write("---\n\n")
+        parts.extend(self._format_markdown_items(_calendar_markdown, self._items))
     
-    def _export_tasks_markdown(self, f):
+    def _export_tasks_markdown(self, parts: List[str]):
         """Export tasks to Markdown"""
         # Group by status
-        by_status = {}
-        for item in self.data:
-            status = item.get('status', 'unknown')
-            if status not in by_status:
-                by_status[status] = []
-            by_status[status].append(item)
+        by_status = defaultdict(list)
+        for item in self._items:
+            by_status[item.get('status', 'unknown')].append(item)
         
+        lines = iter(self._format_markdown_items(
+            _task_markdown, [task for tasks in by_status.values() for task in tasks]
+        ))
         for status, tasks in by_status.items():
-            f.write(f"## {status.title()} Tasks\n\n")
-            
-            for task in tasks:
-                priority = task.get('priority', 'medium')
-                emoji = {"urgent": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}.get(priority, "⚪")
-                
-                f.write(f"- {emoji} **{task.get('title', 'Untitled Task')}**")
-                
-                if task.get('due_date'):
-                    f.write(f" (Due: {task['due_date']})")
-                
-                if task.get('project'):
-                    f.write(f" - *{task['project']}*")
-                
-                f.write("\n")
-            
-            f.write("\n")
+            title = _STATUS_TITLE.get(status) or status.title()
+            parts.append(f"## {title} Tasks\n\n")
+            parts.extend(islice(lines, len(tasks)))
+            parts.append("\n")
     
-    def _export_comms_markdown(self, f):
+    def _export_comms_markdown(self, parts: List[str]):
         """Export communications to Markdown"""
-        for item in self.data:
-            comm_type = item.get('type', 'unknown')
-            emoji = {"email": "📧", "message": "💬", "call": "📞"}.get(comm_type, "📄")
-            
-            f.write(f"## {emoji} {item.get('subject', 'No Subject')}\n\n")
-            f.write(f"**From:** {item.get('from', 'Unknown')}\n\n")
-            
-            if item.get('to'):
-                to_list = ", ".join(item['to']) if isinstance(item['to'], list) else item['to']
-                f.write(f"**To:** {to_list}\n\n")
-            
-            f.write(f"**Time:** {item.get('timestamp', 'N/A')}\n\n")
-            
-            if item.get('body_preview'):
-                f.write(f"**Preview:** {item['body_preview']}\n\n")
-            
-            f.write("---\n\n")
+        parts.extend(self._format_markdown_items(_comms_markdown, self._items))
     
-    def _export_identity_markdown(self, f):
+    def _export_identity_markdown(self, parts: List[str]):
         """Export identity/contacts to Markdown"""
-        for item in self.data:
-            name = item.get('name', {})
-            display_name = name.get('display', name.get('full', 'Unknown'))
-            
-            f.write(f"## {display_name}\n\n")
-            f.write(f"**Type:** {item.get('type', 'unknown')}\n\n")
-            
-            if item.get('emails'):
-                f.write("**Emails:**\n")
-                for email in item['emails']:
-                    f.write(f"- {email}\n")
-                f.write("\n")
-            
-            if item.get('phones'):
-                f.write("**Phones:**\n")
-                for phone in item['phones']:
-                    f.write(f"- {phone}\n")
-                f.write("\n")
-            
-            if item.get('tags'):
-                tags = ", ".join(item['tags'])
-                f.write(f"**Tags:** {tags}\n\n")
-            
-            f.write("---\n\n")
+        parts.extend(self._format_markdown_items(_identity_markdown, self._items))
     
-    def _export_docs_markdown(self, f):
+    def _export_docs_markdown(self, parts: List[str]):
         """Export documents to Markdown"""
-        for item in self.data:
-            f.write(f"## {item.get('title', 'Untitled Document')}\n\n")
-            f.write(f"**Type:** {item.get('type', 'unknown')}\n\n")
-            
-            if item.get('url'):
-                f.write(f"**URL:** [{item['url']}]({item['url']})\n\n")
-            
-            if item.get('content_preview'):
-                f.write(f"**Preview:**\n\n{item['content_preview']}\n\n")
-            
-            if item.get('tags'):
-                tags = ", ".join(item['tags'])
-                f.write(f"**Tags:** {tags}\n\n")
-            
-            f.write("---\n\n")
+        parts.extend(self._format_markdown_items(_docs_markdown, self._items))
     
-    def _export_generic_markdown(self, f):
+    def _export_generic_markdown(self, parts: List[str]):
         """Export generic data to Markdown"""
-        for item in self.data:
-            f.write(f"## Item: {item.get('id', 'unknown')}\n\n")
-            f.write("```json\n")
-            f.write(json.dumps(item, indent=2))
-            f.write("\n```\n\n")
-            f.write("---\n\n")
+        parts.extend(self._format_markdown_items(_generic_markdown, self._items))
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 def main():
     parser = argparse.ArgumentParser(description="Export CAP data to various formats")
@@ -262,6 +437,8 @@ def main():
                         help="CAP shelf type")
     parser.add_argument("--output", required=True, help="Output file path")
     parser.add_argument("--data", help="JSON data to export (or read from stdin)")
+    parser.add_argument("--workers", type=_positive_int, default=1,
+                        help="Processes used to format Markdown exports (default: 1)")
     
     args = parser.parse_args()
     
@@ -275,7 +452,7 @@ def main():
     else:
         # Read from stdin
         try:
-            data = json.load(sys.stdin)
+            data = json.loads(sys.stdin.buffer.read())
         except json.JSONDecodeError as e:
             print(f"❌ Error: Invalid JSON from stdin.\n{str(e)}", file=sys.stderr)
             sys.exit(1)
@@ -287,7 +464,7 @@ def main():
         data = [data]
     
     # Export
-    exporter = CAPExporter(data, args.shelf)
+    exporter = CAPExporter(data, args.shelf, workers=args.workers)
     
     format_map = {
         "csv": exporter.export_csv,
@@ -1,16 +1,22 @@
 import json
 import sys
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 
-def format_event(event):
-    start_time = datetime.fromisoformat(event["start_time"]).strftime("%I:%M %p")
-    return f"- **{event['title']}** at {start_time}"
+# ("%I", "%p") for each hour of the day
+_HOUR_LABELS = tuple((f"{hour % 12 or 12:02d}", "AM" if hour < 12 else "PM") for hour in range(24))
 
-def format_task(task):
-    return f"- **{task['title']}** (Priority: {task['priority']})"
+@lru_cache(maxsize=1024)
+def _format_time(iso):
+    # Always parse, so malformed timestamps raise exactly as before; only strftime is replaced
+    parsed = datetime.fromisoformat(iso)
+    hh, ampm = _HOUR_LABELS[parsed.hour]
+    return f"{hh}:{parsed.minute:02d} {ampm}"
 
-def format_comm(comm):
-    return f"- **{comm['subject']}** from {comm['from']}"
+_event_fields = itemgetter("title", "start_time")
+_task_fields = itemgetter("title", "priority")
+_comm_fields = itemgetter("subject", "from")
 
 def main():
     if len(sys.argv) != 2:
@@ -23,26 +29,27 @@ def main():
         print("Error: Invalid JSON data provided.", file=sys.stderr)
         sys.exit(1)
 
-    output = "# Your Daily Briefing\n\n"
+    parts = ["# Your Daily Briefing\n\n"]
 
     if data.get("calendar_events"):
-        output += "## Today's Events\n"
-        for event in data["calendar_events"]:
-            output += format_event(event) + "\n"
-        output += "\n"
+        parts.append("## Today's Events\n")
+        parts.append("\n".join([f"- **{title}** at {_format_time(start)}"
+                                for title, start in map(_event_fields, data["calendar_events"])]))
+        parts.append("\n\n")
 
     if data.get("due_tasks"):
-        output += "## Due Tasks\n"
-        for task in data["due_tasks"]:
-            output += format_task(task) + "\n"
-        output += "\n"
+        parts.append("## Due Tasks\n")
+        parts.append("\n".join([f"- **{title}** (Priority: {priority})"
+                                for title, priority in map(_task_fields, data["due_tasks"])]))
+        parts.append("\n\n")
 
     if data.get("recent_comms"):
-        output += "## Recent Communications\n"
-        for comm in data["recent_comms"]:
-            output += format_comm(comm) + "\n"
+        parts.append("## Recent Communications\n")
+        parts.append("\n".join([f"- **{subject}** from {sender}"
+                                for subject, sender in map(_comm_fields, data["recent_comms"])]))
+        parts.append("\n")
 
-    print(output)
+    print("".join(parts))
 
 if __name__ == "__main__":
     main()